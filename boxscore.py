@@ -0,0 +1,241 @@
+import os
+import re
+import pandas as pd
+from bs4 import BeautifulSoup, Comment
+from io import StringIO
+from teams import team_name_mapping, team_ids
+from table_schemas import apply_table_schema, memory_usage_kb
+
+# Shared boxscore extraction used by game.py and the offline rebuild
+
+BASE_URL = 'https://www.pro-football-reference.com'
+SCHEDULE_URL = f'{BASE_URL}/years/2024/games.htm'
+SCHEDULE_PAGE = re.compile(r'/years/(\d{4})/games\.htm$')
+
+# Browser-like User-Agent for pages fetched with plain HTTP requests
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.5938.88 Safari/537.36'}
+
+# Tables scraped from every boxscore page
+table_names = ['scoring', 'game_info', 'expected_points', 'team_stats', 'player_offense', 'player_defense', 'returns', 'kicking', 'passing_advanced', 'rushing_advanced', 'receiving_advanced', 'defense_advanced', 'home_drives', 'away_drives']
+
+def get_actual_header(soup):
+    # Find the 'thead' element
+    thead = soup.find('thead')
+    if thead:
+        # Find all rows in the thead
+        header_rows = thead.find_all('tr')
+
+        # Filter out rows with class 'over_header' (these are the grouping headers)
+        actual_header_row = None
+        for row in header_rows:
+            if 'over_header' not in row.get('class', []):
+                actual_header_row = row
+                break
+
+        # Now get the actual headers
+        if actual_header_row:
+            headers = [th.text.strip() for th in actual_header_row.find_all('th')]
+            return headers
+    return []
+
+# Function to replace team abbreviations in a DataFrame
+def replace_team_abbreviations(df):
+    for abbr, full_name in team_name_mapping.items():
+        df.replace(abbr, full_name, inplace=True)
+    return df
+
+def read_html_table(table):
+    """Read HTML table and avoid the FutureWarning."""
+    html_string = str(table)
+    return pd.read_html(StringIO(html_string))[0]
+
+def clean_data(df):
+    # Define keywords that indicate the row should be removed (unwanted headers)
+    keywords_to_remove = ['Scoring', 'Punting', 'Player', 'Passing', 'Receiving', 'Kick Returns', 'Punt Returns', 'Fumbles']
+
+    # Filter out any rows that contain any of these keywords in any cell
+    df = df[~df.apply(lambda row: row.astype(str).str.contains('|'.join(keywords_to_remove), case=False, na=False).any(), axis=1)]
+
+    # Drop fully empty rows
+    df = df.dropna(how='all')
+
+    # Reset index after filtering
+    df = df.reset_index(drop=True)
+
+    return df
+
+def parse_schedule(html, season, base_url=BASE_URL):
+    """Return the games listed in the season schedule page that have a boxscore link."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Locate the games table
+    schedule_table = soup.find('table', {'id': 'games'})
+    rows = schedule_table.find_all('tr')
+
+    games = []
+    for game_row in rows:
+        boxscore_td = game_row.find('td', attrs={'data-stat': 'boxscore_word'})
+        if not boxscore_td:
+            continue
+
+        week_th = game_row.find('th', attrs={'data-stat': 'week_num'})
+        winner_td = game_row.find('td', attrs={'data-stat': 'winner'})
+        loser_td = game_row.find('td', attrs={'data-stat': 'loser'})
+
+        week_number = int(week_th.text.strip()) if week_th else 1
+        winner_abbr = winner_td.text.strip() if winner_td else 'Unknown_Winner'
+        loser_abbr = loser_td.text.strip() if loser_td else 'Unknown_Loser'
+
+        boxscore_link = boxscore_td.find('a')
+        if not boxscore_link:
+            continue
+
+        # Finished games link to a 'boxscore' with points filled in; upcoming ones link to a 'preview'
+        pts_win_td = game_row.find('td', attrs={'data-stat': 'pts_win'})
+        pts_lose_td = game_row.find('td', attrs={'data-stat': 'pts_lose'})
+        pts_win = pts_win_td.text.strip() if pts_win_td else ''
+        pts_lose = pts_lose_td.text.strip() if pts_lose_td else ''
+        is_final = boxscore_link.text.strip().lower() == 'boxscore' and pts_win != '' and pts_lose != ''
+
+        games.append({
+            'season': season,
+            'week': week_number,
+            'winner': team_name_mapping.get(winner_abbr, winner_abbr),
+            'loser': team_name_mapping.get(loser_abbr, loser_abbr),
+            'url': f"{base_url}{boxscore_link['href']}",
+            'final': is_final,
+            'score': f'{pts_win}-{pts_lose}' if is_final else '',
+        })
+    return games
+
+def get_schedule_season(schedule_url):
+    match = SCHEDULE_PAGE.search(schedule_url)
+    if not match:
+        raise ValueError(f"Not a season schedule URL: {schedule_url}")
+    return int(match.group(1))
+
+def get_season_dir(base_dir, season):
+    return os.path.join(base_dir, f'Season {season}')
+
+def get_game_dir(base_dir, season, week_number, winner, loser):
+    # Every writer uses this layout, so a game always lands in the same directory
+    week_dir = os.path.join(get_season_dir(base_dir, season), f'Week {week_number}')
+    return os.path.join(week_dir, f'{winner} vs {loser}')
+
+def find_inner_div(outer_div, table_name):
+    inner_div = outer_div.find('div', id=f'div_{table_name}')
+    if inner_div:
+        return inner_div
+
+    # Without a browser running the page's scripts most tables are still inside HTML comments
+    for comment in outer_div.find_all(string=lambda text: isinstance(text, Comment)):
+        inner_div = BeautifulSoup(comment, 'html.parser').find('div', id=f'div_{table_name}')
+        if inner_div:
+            return inner_div
+    return None
+
+PLAYER_HREF = re.compile(r'/players/\w/(\w+)\.htm')
+
+def get_player_links(table):
+    """Map (player name, team abbreviation) to the PFR player ID carried by each player cell."""
+    player_links = {}
+    for row in table.find_all('tr'):
+        player_cell = row.find(['th', 'td'], attrs={'data-stat': 'player'})
+        if not player_cell:
+            continue
+
+        pfr_id = player_cell.get('data-append-csv')
+        if not pfr_id:
+            link = player_cell.find('a', href=True)
+            match = PLAYER_HREF.search(link['href']) if link else None
+            pfr_id = match.group(1) if match else None
+        if not pfr_id:
+            continue
+
+        team_cell = row.find('td', attrs={'data-stat': 'team'})
+        team = team_cell.text.strip() if team_cell else ''
+        player_links[(player_cell.text.strip(), team)] = pfr_id
+    return player_links
+
+def add_id_columns(df, player_links):
+    """Add pfr_id and team_id columns ahead of the stats, before team names are expanded."""
+    teams = df['Tm'] if 'Tm' in df.columns else None
+    if isinstance(teams, pd.DataFrame):
+        teams = teams.iloc[:, 0]
+
+    if 'Player' in df.columns and player_links:
+        # Fall back to the name alone when the page has no team cell for the row
+        by_name = {}
+        for (name, _), pfr_id in player_links.items():
+            by_name.setdefault(name, set()).add(pfr_id)
+        by_name = {name: ids.pop() for name, ids in by_name.items() if len(ids) == 1}
+
+        names = df['Player'].astype(str).str.strip()
+        row_teams = teams.astype(str).str.strip() if teams is not None else pd.Series('', index=df.index)
+        pfr_ids = [player_links.get((name, team), by_name.get(name)) for name, team in zip(names, row_teams)]
+        df.insert(0, 'pfr_id', pfr_ids)
+
+    if teams is not None:
+        df.insert(1 if 'pfr_id' in df.columns else 0, 'team_id', teams.map(team_ids))
+    return df
+
+def extract_game_tables(html, game_url):
+    """Extract and clean every boxscore table found in a game page."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    game_tables = {}
+    memory_before = memory_after = 0
+    for table_name in table_names:
+        div_id = f'all_{table_name}'
+        outer_div = soup.find('div', id=div_id)
+        if outer_div:
+            inner_div = find_inner_div(outer_div, table_name)
+            if inner_div:
+                table = inner_div.find('table')
+                if table:
+                    # Get actual headers, ignoring over-headers
+                    headers = get_actual_header(BeautifulSoup(str(table), 'html.parser'))
+                    df = read_html_table(table)
+
+                    # Assign correct headers to the DataFrame if they match the columns
+                    if headers and len(headers) == df.shape[1]:
+                        df.columns = headers
+
+                    # Key rows by PFR player ID and team ID for integer joins
+                    df = add_id_columns(df, get_player_links(table))
+
+                    # Clean the DataFrame
+                    df = clean_data(df)
+                    df = replace_team_abbreviations(df)
+
+                    # Coerce to the compact dtypes registered for this table
+                    memory_before += memory_usage_kb(df)
+                    df = apply_table_schema(table_name, df)
+                    memory_after += memory_usage_kb(df)
+
+                    game_tables[table_name] = df
+                    print(f"Scraped {table_name} table for {game_url}")
+                else:
+                    print(f"No table found inside div_{table_name} for {game_url}")
+            else:
+                print(f"No inner div with id div_{table_name} found for {game_url}")
+        else:
+            print(f"No outer div with id all_{table_name} found for {game_url}")
+
+    if game_tables:
+        print(f"Table memory for {game_url}: {memory_before:.1f} KB before typing, {memory_after:.1f} KB after")
+    return game_tables
+
+def write_csv_atomic(df, file_path):
+    # Write to a temporary file first so readers never see a half-written CSV
+    tmp_path = f'{file_path}.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, file_path)
+
+def save_game_tables(game_tables, game_dir):
+    os.makedirs(game_dir, exist_ok=True)
+    for table_name, df in game_tables.items():
+        file_name = f'{table_name}.csv'
+        file_path = os.path.join(game_dir, file_name)
+        write_csv_atomic(df, file_path)
+        print(f"Saved {table_name} table to {file_path}")
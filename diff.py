@@ -1,4 +1,6 @@
 import pandas as pd
+from features import features_to_diff
+from feature_store import games_season, write_game_diffs
 
 # Example loading data
 df_schedule = pd.read_csv('NFL_Finished_Games.csv')  # Your merged schedule with stats
@@ -18,15 +20,6 @@ df_away = pd.merge(df_schedule, team_strength, how='left', left_on='Loser', righ
 # Drop redundant columns from the second merge (like 'Team_away' or 'Week_away')
 df_games = df_away.drop(columns=['Team_away'])
 
-# List of features for which we'll calculate the home-away difference
-features_to_diff = [
-    'Off_Rush_Yds', 'Off_YPCar', 'Off_YPRec', 'Off_Pass_Yds', 'Off_Scoring',
-    'Off_Completion_Rate', 'Off_3rd_Down_Conversion_Rate', 'Off_4th_Down_Conversion_Rate',
-    'Def_Rush_Yds_Allowed', 'Def_YPCar_Allowed', 'Def_Pass_Yds_Allowed', 'Def_INT',
-    'Def_Yds/Rec_Allowed', 'Def_Sacks', 'Def_3rd_Down_Stop_Rate', 'Def_4th_Down_Stop_Rate',
-    'FG_Made', 'FG_Attempted', 'XP_Made', 'XP_%', 'FG_30+', 'FG_40+', 'FG_50+', 'FG_60+'
-]
-
 # Function to calculate differences between home and away teams and round to 2 decimal places
 def calculate_feature_differences(df_games):
     for feature in features_to_diff:
@@ -46,3 +39,6 @@ df_games = calculate_feature_differences(df_games)
 df_games.to_csv("NFL_Games_With_Feature_Differences.csv", index=False)
 
 print("Feature differences have been calculated and saved to NFL_Games_With_Feature_Differences.csv")
+
+# Persist the difference matrix as a memory-mapped array for training jobs
+write_game_diffs(df_games, features_to_diff, games_season(df_games))
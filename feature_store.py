@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+from teams import team_name_mapping, team_ids
+
+# Memory-mapped store for team feature vectors (process_team_strength.py) and
+# per-game difference matrices (diff.py). Arrays are plain .npy files opened
+# with mmap_mode='r', so every process reading them shares one copy of the
+# pages. index.json records which file holds which season and week, and the
+# feature order of each array. Every write goes to a new versioned file and
+# index.json is repointed at it, because a file a reader has mapped can't be
+# replaced on Windows.
+#
+#   team features: float32 [team_id - 1, feature] per (season, week)
+#   game diffs:    float32 [game, feature] per season, with an int16
+#                  [game, (week, home team_id, away team_id)] key array
+
+STORE_DIR = 'Feature Store'
+
+team_ids_by_name = {name: team_ids[abbr] for abbr, name in team_name_mapping.items()}
+
+def _index_path(store_dir):
+    return os.path.join(store_dir, 'index.json')
+
+def load_index(store_dir=STORE_DIR):
+    if not os.path.exists(_index_path(store_dir)):
+        return {'team_features': {}, 'game_diffs': {}}
+    with open(_index_path(store_dir)) as f:
+        return json.load(f)
+
+def _save_index(index, store_dir):
+    tmp_path = f'{_index_path(store_dir)}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, _index_path(store_dir))
+
+def _write_array(values, file_path, dtype):
+    # Fill a memmap under a temporary name, then rename it so readers never see a partial file
+    tmp_path = f'{file_path}.tmp.npy'
+    array = open_memmap(tmp_path, mode='w+', dtype=dtype, shape=values.shape)
+    array[:] = values
+    array.flush()
+    del array
+    os.rename(tmp_path, file_path)
+
+def _versioned_name(store_dir, prefix, previous_entry):
+    # Skip past any version left on disk, e.g. by a run that died before updating the index
+    versions = [previous_entry['version']] if previous_entry else [0]
+    for file_name in os.listdir(store_dir):
+        match = re.fullmatch(rf'{re.escape(prefix)}_v(\d+)\.npy', file_name)
+        if match:
+            versions.append(int(match.group(1)))
+    version = max(versions) + 1
+    return version, f'{prefix}_v{version}.npy'
+
+def _remove_stale_versions(store_dir, prefix, current_file):
+    # Older versions may still be mapped by a training job (Windows won't delete
+    # those), so anything left behind is tried again on the next write
+    for file_name in os.listdir(store_dir):
+        if re.fullmatch(rf'{re.escape(prefix)}_v\d+\.npy', file_name) and file_name != current_file:
+            try:
+                os.remove(os.path.join(store_dir, file_name))
+            except OSError:
+                pass
+
+def _season_of(dates):
+    # A season is named for the year it starts in, and its first games are in September
+    dates = pd.to_datetime(dates, errors='coerce').dropna()
+    if dates.empty:
+        raise ValueError("Cannot tell the season: no valid game dates")
+    return int(dates.min().year)
+
+def finished_season_and_week(finished_games_file='Finished_Games.csv'):
+    """Season and latest completed week covered by Team_Strength.csv, from schedule.py's output."""
+    if not os.path.exists(finished_games_file):
+        raise FileNotFoundError(f"{finished_games_file} not found; run schedule.py first so the team features can be filed under a season and week")
+    finished_games = pd.read_csv(finished_games_file)
+    weeks = pd.to_numeric(finished_games['Week'], errors='coerce')
+    if weeks.isna().all():
+        raise ValueError(f"{finished_games_file} has no finished games with a valid week")
+    return _season_of(finished_games['Date']), int(weeks.max())
+
+def games_season(df_games):
+    """Season of the games in diff.py's output, from their dates."""
+    return _season_of(df_games['Date'])
+
+def write_team_features(team_strength, season, week, store_dir=STORE_DIR):
+    """Store every numeric team strength column for one season/week snapshot."""
+    os.makedirs(store_dir, exist_ok=True)
+    team_strength = team_strength.copy()
+    team_strength.columns = team_strength.columns.str.strip()
+    features = [column for column in team_strength.columns if column != 'Team' and pd.api.types.is_numeric_dtype(team_strength[column])]
+
+    # One row per team, positioned by team_id so lookups never need a search
+    values = np.full((len(team_ids), len(features)), np.nan, dtype=np.float32)
+    for team, row in zip(team_strength['Team'].str.strip(), team_strength[features].to_numpy(dtype=np.float32)):
+        if team in team_ids_by_name:
+            values[team_ids_by_name[team] - 1] = row
+
+    index = load_index(store_dir)
+    previous_entry = index['team_features'].get(f'{season}-{week}')
+    prefix = f'team_features_{season}_week{week:02d}'
+    version, file_name = _versioned_name(store_dir, prefix, previous_entry)
+    _write_array(values, os.path.join(store_dir, file_name), np.float32)
+
+    index['team_features'][f'{season}-{week}'] = {'season': season, 'week': week, 'version': version, 'file': file_name, 'features': features}
+    _save_index(index, store_dir)
+    _remove_stale_versions(store_dir, prefix, file_name)
+    print(f"Saved {season} week {week} team features to {os.path.join(store_dir, file_name)}")
+
+def write_game_diffs(df_games, features, season, store_dir=STORE_DIR):
+    """Store the '<feature>_Diff' columns of diff.py's output as one matrix per season."""
+    os.makedirs(store_dir, exist_ok=True)
+    values = df_games[[f'{feature}_Diff' for feature in features]].to_numpy(dtype=np.float32)
+    keys = np.column_stack([
+        pd.to_numeric(df_games['Week'], errors='coerce').fillna(0).to_numpy(),
+        df_games['Winner'].str.strip().map(team_ids_by_name).fillna(0).to_numpy(),
+        df_games['Loser'].str.strip().map(team_ids_by_name).fillna(0).to_numpy(),
+    ]).astype(np.int16)
+
+    index = load_index(store_dir)
+    previous_entry = index['game_diffs'].get(str(season))
+    version, diffs_file = _versioned_name(store_dir, f'game_diffs_{season}', previous_entry)
+    keys_file = f'game_keys_{season}_v{version}.npy'
+    _write_array(values, os.path.join(store_dir, diffs_file), np.float32)
+    _write_array(keys, os.path.join(store_dir, keys_file), np.int16)
+
+    index['game_diffs'][str(season)] = {
+        'season': season, 'version': version, 'file': diffs_file, 'keys_file': keys_file,
+        'key_columns': ['week', 'home_team_id', 'away_team_id'], 'features': list(features),
+    }
+    _save_index(index, store_dir)
+    _remove_stale_versions(store_dir, f'game_diffs_{season}', diffs_file)
+    _remove_stale_versions(store_dir, f'game_keys_{season}', keys_file)
+    print(f"Saved {len(values)} {season} game difference vectors to {os.path.join(store_dir, diffs_file)}")
+
+def load_team_features(season, week, store_dir=STORE_DIR):
+    """Return (features, array) where array[team_id - 1] is that team's feature vector."""
+    entry = load_index(store_dir)['team_features'][f'{season}-{week}']
+    return entry['features'], np.load(os.path.join(store_dir, entry['file']), mmap_mode='r')
+
+def load_game_diffs(season, week=None, store_dir=STORE_DIR):
+    """Return (features, keys, diffs) for a season, optionally limited to one week."""
+    entry = load_index(store_dir)['game_diffs'][str(season)]
+    keys = np.load(os.path.join(store_dir, entry['keys_file']), mmap_mode='r')
+    diffs = np.load(os.path.join(store_dir, entry['file']), mmap_mode='r')
+    if week is not None:
+        # Fancy indexing copies, so only the selected week's rows are read
+        rows = np.flatnonzero(keys[:, 0] == week)
+        keys, diffs = keys[rows], diffs[rows]
+    return entry['features'], keys, diffs
@@ -0,0 +1,8 @@
+# Team strength features for which we calculate the home-away difference
+features_to_diff = [
+    'Off_Rush_Yds', 'Off_YPCar', 'Off_YPRec', 'Off_Pass_Yds', 'Off_Scoring',
+    'Off_Completion_Rate', 'Off_3rd_Down_Conversion_Rate', 'Off_4th_Down_Conversion_Rate',
+    'Def_Rush_Yds_Allowed', 'Def_YPCar_Allowed', 'Def_Pass_Yds_Allowed', 'Def_INT',
+    'Def_Yds/Rec_Allowed', 'Def_Sacks', 'Def_3rd_Down_Stop_Rate', 'Def_4th_Down_Stop_Rate',
+    'FG_Made', 'FG_Attempted', 'XP_Made', 'XP_%', 'FG_30+', 'FG_40+', 'FG_50+', 'FG_60+'
+]
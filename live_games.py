@@ -0,0 +1,161 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+import requests
+from boxscore import BASE_URL, REQUEST_HEADERS, parse_schedule, get_schedule_season, get_game_dir, extract_game_tables, save_game_tables
+from page_archive import archive_page
+from player_ids import PlayerRegistry
+
+# Game-day polling mode: reload the schedule on a short interval and only
+# fetch boxscores for games that just went final or whose page has changed.
+# Pages are fetched with plain HTTP requests, so --base-url can point at a
+# local stub server.
+
+base_dir = 'Game Stats'
+state_file = 'live_state.json'
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_state(state, path):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+def fetch(session, url, timeout):
+    response = session.get(url, headers=REQUEST_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+def games_to_refresh(games, state, now, recheck_minutes, recheck_interval):
+    """Pick the final games that are new, whose score changed, or that went final recently.
+
+    Games just seen going final come first, then finished games with no saved
+    output, then re-checks, so a long backfill never delays a fresh result.
+    """
+    just_final, backfill, recheck = [], [], []
+    for game in games:
+        if not game['final']:
+            continue
+        seen = state.get(game['url'])
+        if seen is None:
+            backfill.append(game)
+        elif seen['score'] != game['score']:
+            just_final.append(game)
+        elif seen['final_at'] and now - seen['final_at'] < recheck_minutes * 60 and now - seen['checked_at'] >= recheck_interval:
+            # PFR keeps correcting stats for a while after the final whistle
+            recheck.append(game)
+    return just_final + backfill + recheck
+
+def track_upcoming(games, state):
+    # Remember games before they finish; only games seen going final get re-checked
+    for game in games:
+        if not game['final'] and game['url'] not in state:
+            state[game['url']] = {'score': '', 'sha256': None, 'final_at': None, 'checked_at': 0}
+
+def seed_state(games, state):
+    """On first start, treat final games whose output already exists as seen.
+
+    Without this every finished game of the season would count as new and be
+    fetched in one go; only games with no saved tables are fetched now.
+    """
+    seeded = 0
+    for game in games:
+        if game['final'] and os.path.isdir(get_game_dir(base_dir, game['season'], game['week'], game['winner'], game['loser'])):
+            # No page hash and a final time of 0, so the game is never re-checked
+            state[game['url']] = {'score': game['score'], 'sha256': None, 'final_at': 0, 'checked_at': 0}
+            seeded += 1
+    print(f"Seeded live state with {seeded} games already in {base_dir}")
+
+def refresh_game(session, game, state, now, timeout, player_registry):
+    html = fetch(session, game['url'], timeout)
+    sha256 = hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    seen = state.get(game['url'])
+    if seen is None:
+        # Already final the first time we saw it, so we can't tell when it ended; fetch it once and don't re-check it
+        final_at = 0
+    elif seen['score'] != game['score']:
+        final_at = now
+    else:
+        final_at = seen['final_at']
+    if seen and seen['sha256'] == sha256:
+        state[game['url']] = {**seen, 'final_at': final_at, 'checked_at': now}
+        return False
+
+    archive_page(game['url'], html)
+    game_tables = player_registry.key_tables(extract_game_tables(html, game['url']))
+    save_game_tables(game_tables, get_game_dir(base_dir, game['season'], game['week'], game['winner'], game['loser']))
+    player_registry.save()
+    state[game['url']] = {'score': game['score'], 'sha256': sha256, 'final_at': final_at, 'checked_at': now}
+    return True
+
+def poll_once(session, schedule_url, base_url, state, recheck_minutes, recheck_interval, timeout, player_registry, request_delay):
+    schedule_html = fetch(session, schedule_url, timeout)
+    # Keep the schedule with its final results so rebuild_game_stats.py uses the same winners and losers
+    archive_page(schedule_url, schedule_html)
+    games = parse_schedule(schedule_html, get_schedule_season(schedule_url), base_url=base_url)
+
+    if not state:
+        seed_state(games, state)
+    track_upcoming(games, state)
+
+    now = time.time()
+    updated = 0
+    for i, game in enumerate(games_to_refresh(games, state, now, recheck_minutes, recheck_interval)):
+        # Stay under PFR's rate limit when several games finish at once
+        if i > 0:
+            time.sleep(request_delay)
+        try:
+            if refresh_game(session, game, state, now, timeout, player_registry):
+                updated += 1
+                print(f"{datetime.now(timezone.utc):%H:%M:%S} Updated Week {game['week']} {game['winner']} vs {game['loser']} ({game['score']})")
+        except requests.RequestException as e:
+            print(f"Failed to fetch {game['url']}: {e}")
+        except Exception as e:
+            print(f"Failed to update {game['url']}: {e}")
+    return updated
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Poll the schedule and refresh boxscores as games finish.')
+    parser.add_argument('--base-url', default=BASE_URL, help='site root, e.g. a local stub server')
+    parser.add_argument('--season', type=int, default=2024)
+    parser.add_argument('--interval', type=float, default=60, help='seconds between schedule polls')
+    parser.add_argument('--recheck-minutes', type=float, default=180, help='keep re-checking a game this long after it goes final')
+    parser.add_argument('--recheck-interval', type=float, default=600, help='seconds between re-checks of an already final game')
+    parser.add_argument('--request-delay', type=float, default=3, help='seconds to wait between boxscore requests')
+    parser.add_argument('--timeout', type=float, default=30, help='HTTP timeout in seconds')
+    parser.add_argument('--once', action='store_true', help='poll a single time and exit')
+    args = parser.parse_args()
+
+    schedule_url = f'{args.base_url}/years/{args.season}/games.htm'
+    state = load_state(state_file)
+    session = requests.Session()
+    player_registry = PlayerRegistry(base_dir)
+
+    while True:
+        try:
+            updated = poll_once(session, schedule_url, args.base_url, state, args.recheck_minutes, args.recheck_interval, args.timeout, player_registry, args.request_delay)
+            if updated:
+                print(f"Refreshed {updated} games")
+        except requests.RequestException as e:
+            print(f"Failed to load schedule {schedule_url}: {e}")
+        except Exception as e:
+            print(f"Failed to poll {schedule_url}: {e}")
+        finally:
+            # Keep whatever this poll managed to refresh, even if it failed part way
+            try:
+                save_state(state, state_file)
+            except OSError as e:
+                print(f"Failed to save {state_file}: {e}")
+
+        if args.once:
+            break
+        time.sleep(args.interval)
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import time
+import numpy as np
+import pandas as pd
+from features import features_to_diff
+
+# Precomputed home-minus-away differences over features_to_diff for every
+# pair of teams in Team_Strength.csv. The cache file records the hash of the
+# strength file it was built from and is rebuilt whenever that changes.
+
+STRENGTH_FILE = 'Team_Strength.csv'
+CACHE_FILE = 'Matchup_Cache.npz'
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def build_matchup_diffs(team_strength):
+    """Return (teams, diffs) where diffs[i, j] is team i minus team j, rounded like diff.py."""
+    team_strength = team_strength.copy()
+    team_strength.columns = team_strength.columns.str.strip()
+    teams = team_strength['Team'].str.strip().to_numpy(dtype=str)
+    values = team_strength[features_to_diff].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    diffs = (values[:, None, :] - values[None, :, :]).round(2)
+    return teams, diffs
+
+class MatchupCache:
+    def __init__(self, strength_file=STRENGTH_FILE, cache_file=CACHE_FILE, check_interval=1.0):
+        self.strength_file = strength_file
+        self.cache_file = cache_file
+        # Lookups stat Team_Strength.csv at most this often to notice changes
+        self.check_interval = check_interval
+        self.features = list(features_to_diff)
+        self._load()
+
+    def _load(self):
+        source_sha256 = file_sha256(self.strength_file)
+        self._source_stat = self._stat()
+        self._checked_at = time.monotonic()
+
+        cached = None
+        if os.path.exists(self.cache_file):
+            with np.load(self.cache_file) as data:
+                if str(data['source_sha256']) == source_sha256 and list(data['features']) == self.features:
+                    cached = data['teams'], data['diffs']
+
+        if cached is None:
+            teams, diffs = build_matchup_diffs(pd.read_csv(self.strength_file))
+            tmp_path = f'{self.cache_file}.tmp.npz'
+            np.savez(tmp_path, teams=teams, features=np.array(self.features), diffs=diffs, source_sha256=np.array(source_sha256))
+            os.replace(tmp_path, self.cache_file)
+            print(f"Rebuilt matchup cache for {len(teams)} teams and saved it to {self.cache_file}")
+        else:
+            teams, diffs = cached
+
+        self.teams = list(teams)
+        # Lookups return views into this array, so callers must not be able to modify it
+        diffs.flags.writeable = False
+        self.diffs = diffs
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+
+    def _stat(self):
+        stat = os.stat(self.strength_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """Reload if Team_Strength.csv has changed since the cache was loaded."""
+        self._checked_at = time.monotonic()
+        if self._stat() != self._source_stat:
+            self._load()
+
+    def _maybe_refresh(self):
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh()
+
+    def lookup(self, home, away):
+        """Return the home-minus-away difference vector, aligned with self.features."""
+        self._maybe_refresh()
+        return self.diffs[self.team_index[home], self.team_index[away]]
+
+    def lookup_many(self, homes, aways):
+        """Return one difference row per (home, away) pair."""
+        self._maybe_refresh()
+        home_idx = np.fromiter((self.team_index[team] for team in homes), dtype=np.intp)
+        away_idx = np.fromiter((self.team_index[team] for team in aways), dtype=np.intp)
+        return self.diffs[home_idx, away_idx]
+
+    def lookup_frame(self, homes, aways):
+        """Batched lookup as a DataFrame with diff.py's '<feature>_Diff' column names."""
+        return pd.DataFrame(self.lookup_many(homes, aways), columns=[f'{feature}_Diff' for feature in self.features])
+
+if __name__ == '__main__':
+    cache = MatchupCache()
+    print(f"Matchup cache holds {len(cache.teams)}x{len(cache.teams)} matchups over {len(cache.features)} features")
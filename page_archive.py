@@ -0,0 +1,87 @@
+import csv
+import gzip
+import hashlib
+import os
+from datetime import datetime, timezone
+
+# zstd is preferred for the archive; fall back to gzip when it isn't installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Every fetched page is stored once under the SHA-256 of its HTML, and each
+# fetch is recorded in index.csv keyed by URL and fetch time
+ARCHIVE_DIR = 'Page Archive'
+INDEX_FIELDS = ['url', 'fetched_at', 'sha256', 'codec']
+
+def _index_path(archive_dir):
+    return os.path.join(archive_dir, 'index.csv')
+
+def _blob_path(archive_dir, sha256, codec):
+    return os.path.join(archive_dir, 'objects', sha256[:2], f'{sha256}.{codec}')
+
+def _compress(data):
+    if zstandard is not None:
+        return 'zst', zstandard.ZstdCompressor(level=19).compress(data)
+    return 'gz', gzip.compress(data, compresslevel=9)
+
+def _decompress(data, codec):
+    if codec == 'zst':
+        if zstandard is None:
+            raise RuntimeError("Archive entry is zstd-compressed but the 'zstandard' package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def archive_page(url, html, archive_dir=ARCHIVE_DIR):
+    """Store a fetched page in the archive and return its content hash."""
+    data = html.encode('utf-8')
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    # Only write the blob the first time this exact content is seen
+    existing = [codec for codec in ('zst', 'gz') if os.path.exists(_blob_path(archive_dir, sha256, codec))]
+    if existing:
+        codec = existing[0]
+    else:
+        codec, compressed = _compress(data)
+        blob_path = _blob_path(archive_dir, sha256, codec)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        tmp_path = f'{blob_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, blob_path)
+
+    index_path = _index_path(archive_dir)
+    write_header = not os.path.exists(index_path)
+    with open(index_path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=INDEX_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerow({
+            'url': url,
+            'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'sha256': sha256,
+            'codec': codec,
+        })
+    return sha256
+
+def read_index(archive_dir=ARCHIVE_DIR):
+    index_path = _index_path(archive_dir)
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path, newline='') as f:
+        return list(csv.DictReader(f))
+
+def latest_entries(archive_dir=ARCHIVE_DIR):
+    """Return the most recent archive entry for each URL."""
+    latest = {}
+    for entry in read_index(archive_dir):
+        current = latest.get(entry['url'])
+        if current is None or entry['fetched_at'] >= current['fetched_at']:
+            latest[entry['url']] = entry
+    return latest
+
+def load_page(entry, archive_dir=ARCHIVE_DIR):
+    """Load the HTML for an index entry."""
+    with open(_blob_path(archive_dir, entry['sha256'], entry['codec']), 'rb') as f:
+        return _decompress(f.read(), entry['codec']).decode('utf-8')
@@ -0,0 +1,200 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from boxscore import get_game_dir, extract_game_tables, save_game_tables
+from page_archive import archive_page
+from player_ids import PlayerRegistry
+
+# Boxscore scraping split into three stages joined by bounded queues:
+#   fetch   - the caller's thread loads pages (one browser, so one fetcher)
+#   parse   - BeautifulSoup/pandas extraction in a process pool
+#   persist - a single writer thread assigning player IDs and saving CSVs
+#             with atomic writes
+
+_DONE = object()
+
+class StageMonitor:
+    """Samples per-stage queue depths so the slowest stage shows up as the one with work piling up.
+
+    A full fetch->parse queue or a high parsing count means parsing is the
+    bottleneck; a full parse->persist queue means the writer is.
+    """
+
+    def __init__(self, depth_functions, interval=5.0):
+        self.depth_functions = depth_functions
+        self.interval = interval
+        self.samples = {stage: [] for stage in depth_functions}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def sample(self):
+        depths = {stage: depth() for stage, depth in self.depth_functions.items()}
+        for stage, depth in depths.items():
+            self.samples[stage].append(depth)
+        return depths
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            depths = self.sample()
+            print("Queue depths: " + ', '.join(f"{stage}={depth}" for stage, depth in depths.items()))
+
+    def report(self):
+        print("Queue depth summary (avg / max):")
+        for stage, samples in self.samples.items():
+            if samples:
+                print(f"  {stage}: {sum(samples) / len(samples):.1f} / {max(samples)}")
+
+def parse_game(game, html):
+    """Process-pool entry point: extract the boxscore tables for one game."""
+    return game, extract_game_tables(html, game['url'])
+
+class _InOrderResults:
+    """Hands finished parses to the writer in schedule order.
+
+    Each game is put on the persist queue with its future once the parse has
+    finished, so the queue depth is the writer's backlog; parses that are
+    still running are counted separately, and finished ones waiting on an
+    earlier, slower game sit in the reorder buffer.
+    """
+
+    def __init__(self, persist_queue):
+        self.persist_queue = persist_queue
+        self.lock = threading.Lock()
+        self.ready = {}
+        self.next_seq = 0
+        self.submitted = 0
+        self.parsing = 0
+        self.closed = False
+        self.done_sent = False
+
+    def submit(self, executor, game, html):
+        with self.lock:
+            seq = self.submitted
+            self.submitted += 1
+            self.parsing += 1
+        try:
+            future = executor.submit(parse_game, game, html)
+        except Exception as e:
+            # A broken pool is reported by the writer like any other parse failure
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(lambda f: self._finished(seq, game, f))
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self._flush()
+
+    def buffered(self):
+        return len(self.ready)
+
+    def _finished(self, seq, game, future):
+        with self.lock:
+            self.parsing -= 1
+            # Keep the game with its result so a failed parse can still be named
+            self.ready[seq] = (game, future)
+            self._flush()
+
+    def _flush(self):
+        # Never blocks: the dispatcher's slots keep the persist queue below its maxsize
+        while self.next_seq in self.ready:
+            self.persist_queue.put_nowait(self.ready.pop(self.next_seq))
+            self.next_seq += 1
+        if self.closed and self.next_seq == self.submitted and not self.done_sent:
+            self.persist_queue.put_nowait(_DONE)
+            self.done_sent = True
+
+def _parse_stage(parse_queue, executor, results, slots):
+    try:
+        while True:
+            item = parse_queue.get()
+            if item is _DONE:
+                break
+            game, html = item
+            # Wait for the writer to free a slot so finished results stay bounded
+            slots.acquire()
+            results.submit(executor, game, html)
+    finally:
+        results.close()
+
+def _persist_stage(persist_queue, base_dir, saved_games, slots):
+    player_registry = PlayerRegistry(base_dir)
+    while True:
+        item = persist_queue.get()
+        if item is _DONE:
+            break
+        game, future = item
+        try:
+            game, game_tables = future.result()
+        except Exception as e:
+            print(f"Failed to parse {game['url']}: {e}")
+            slots.release()
+            continue
+
+        try:
+            game_tables = player_registry.key_tables(game_tables)
+            save_game_tables(game_tables, get_game_dir(base_dir, game['season'], game['week'], game['winner'], game['loser']))
+            player_registry.save()
+        except Exception as e:
+            print(f"Failed to save {game['url']}: {e}")
+            continue
+        finally:
+            slots.release()
+        saved_games.append(game)
+
+def run_pipeline(games, fetch_page, base_dir, parse_workers=None, queue_size=8, report_interval=5.0):
+    """Fetch, parse and persist every game, returning the list of games saved.
+
+    fetch_page(url) must return the page HTML; it is only ever called from the
+    calling thread.
+    """
+    parse_workers = parse_workers or 4
+    max_in_flight = parse_workers * 2
+    parse_queue = queue.Queue(maxsize=queue_size)
+    # One extra place for the end-of-work marker
+    persist_queue = queue.Queue(maxsize=max_in_flight + 1)
+    slots = threading.Semaphore(max_in_flight)
+    results = _InOrderResults(persist_queue)
+    saved_games = []
+
+    monitor = StageMonitor({
+        'fetch->parse': parse_queue.qsize,
+        'parsing': lambda: results.parsing,
+        'reorder': results.buffered,
+        'parse->persist': persist_queue.qsize,
+    }, interval=report_interval)
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+        parser = threading.Thread(target=_parse_stage, args=(parse_queue, executor, results, slots))
+        writer = threading.Thread(target=_persist_stage, args=(persist_queue, base_dir, saved_games, slots))
+        parser.start()
+        writer.start()
+        monitor.start()
+
+        start = time.time()
+        try:
+            for game in games:
+                print(f"Scraping game URL: {game['url']}, Week: {game['week']}, Winner: {game['winner']}, Loser: {game['loser']}")
+                html = fetch_page(game['url'])
+
+                # Keep the raw page so the CSVs can be rebuilt offline with rebuild_game_stats.py
+                archive_page(game['url'], html)
+                parse_queue.put((game, html))
+        finally:
+            parse_queue.put(_DONE)
+            parser.join()
+            writer.join()
+            monitor.stop()
+
+    print(f"Saved {len(saved_games)} of {len(games)} games in {time.time() - start:.1f}s")
+    monitor.report()
+    return saved_games
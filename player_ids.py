@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import pandas as pd
+from teams import team_name_mapping, team_ids
+
+# Player and team dimension tables. Extraction tags player rows with the PFR
+# player ID from the page; the registry swaps that for a stable integer
+# player_id so fact tables join on integers across tables and weeks.
+#
+# IDs are handed out by a SQLite table shared by every script writing to the
+# same 'Game Stats' directory (game.py, live_games.py, rebuild_game_stats.py,
+# scrape_worker.py merge), so two of them running at once can't give the same
+# ID to different players. players.csv is an export of that table.
+
+PLAYERS_DB = 'players.sqlite'
+PLAYERS_FILE = 'players.csv'
+TEAMS_FILE = 'teams.csv'
+
+class PlayerRegistry:
+    def __init__(self, base_dir):
+        os.makedirs(base_dir, exist_ok=True)
+        self.path = os.path.join(base_dir, PLAYERS_FILE)
+        self.teams_path = os.path.join(base_dir, TEAMS_FILE)
+        # Autocommit mode; key_tables opens its own transaction per game
+        self.conn = sqlite3.connect(os.path.join(base_dir, PLAYERS_DB), timeout=60, isolation_level=None)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS players (
+                player_id INTEGER PRIMARY KEY,
+                pfr_id TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL DEFAULT ''
+            )
+        ''')
+        # IDs never change once assigned, so lookups can be cached
+        self.player_ids = {}
+        self._dirty = False
+
+    def close(self):
+        self.conn.close()
+
+    def assign(self, pfr_id, name):
+        player_id = self.player_ids.get(pfr_id)
+        if player_id is None:
+            # INSERT OR IGNORE keeps whichever process got there first, and the
+            # SELECT reads back the ID the table holds rather than one we guessed
+            cursor = self.conn.execute('INSERT OR IGNORE INTO players (pfr_id, name) VALUES (?, ?)', (pfr_id, name or ''))
+            if cursor.rowcount:
+                self._dirty = True
+            elif name:
+                cursor = self.conn.execute('UPDATE players SET name = ? WHERE pfr_id = ? AND name != ?', (name, pfr_id, name))
+                self._dirty = self._dirty or cursor.rowcount > 0
+            player_id = self.conn.execute('SELECT player_id FROM players WHERE pfr_id = ?', (pfr_id,)).fetchone()[0]
+            self.player_ids[pfr_id] = player_id
+        return player_id
+
+    def key_tables(self, game_tables):
+        """Replace the pfr_id column of every table with an integer player_id."""
+        keyed_tables = {}
+        # One write transaction per game instead of one per new player
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for table_name, df in game_tables.items():
+                if 'pfr_id' in df.columns:
+                    df = df.copy()
+                    names = df['Player'] if 'Player' in df.columns else pd.Series('', index=df.index)
+                    player_ids = [
+                        self.assign(pfr_id, str(name).strip()) if isinstance(pfr_id, str) else None
+                        for pfr_id, name in zip(df['pfr_id'], names)
+                    ]
+                    df.insert(0, 'player_id', pd.array(player_ids, dtype='Int32'))
+                    df = df.drop(columns=['pfr_id'])
+                keyed_tables[table_name] = df
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            # IDs cached during the rolled back transaction may not exist
+            self.player_ids = {}
+            raise
+        self.conn.execute('COMMIT')
+        return keyed_tables
+
+    def save(self):
+        if not os.path.exists(self.teams_path):
+            teams = pd.DataFrame(
+                [(team_id, abbr, team_name_mapping[abbr]) for abbr, team_id in team_ids.items()],
+                columns=['team_id', 'abbr', 'name'],
+            ).sort_values('team_id')
+            teams.to_csv(self.teams_path, index=False)
+
+        if not self._dirty:
+            return
+        # Export the shared table, including players added by other processes
+        players = pd.read_sql_query('SELECT player_id, pfr_id, name FROM players ORDER BY player_id', self.conn)
+
+        # A per-process temporary name so two exporters never write the same file
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        players.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+from feature_store import finished_season_and_week, write_team_features
 
 # Define file paths for offensive, defensive, and special team stats directories
 offensive_dir = "./Offensive Team Stats"
@@ -141,3 +142,6 @@ team_strength.to_csv("Team_Strength.csv", index=False)
 
 print("Updated Team Strength data has been saved to Team_Strength.csv")
 
+# Persist this week's team feature vectors as a memory-mapped array for training jobs
+season, week = finished_season_and_week()
+write_team_features(team_strength, season, week)
@@ -0,0 +1,50 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from boxscore import SCHEDULE_PAGE, parse_schedule, get_schedule_season, get_game_dir, extract_game_tables, save_game_tables
+from page_archive import ARCHIVE_DIR, latest_entries, load_page
+from player_ids import PlayerRegistry
+
+# Regenerate the whole 'Game Stats' output from the page archive written by
+# game.py, live_games.py and scrape_worker.py merge, without touching the
+# network
+base_dir = 'Game Stats'
+max_workers = os.cpu_count()
+
+def parse_archived_game(entry, game_url):
+    return extract_game_tables(load_page(entry, ARCHIVE_DIR), game_url)
+
+if __name__ == '__main__':
+    start = time.time()
+    entries = latest_entries(ARCHIVE_DIR)
+
+    schedule_urls = sorted(url for url in entries if SCHEDULE_PAGE.search(url))
+    if not schedule_urls:
+        raise SystemExit(f"No archived schedule pages in {ARCHIVE_DIR}; run game.py first")
+
+    # Each season's archived schedule page maps boxscore URLs to week, winner and loser
+    games = []
+    for schedule_url in schedule_urls:
+        games += parse_schedule(load_page(entries[schedule_url], ARCHIVE_DIR), get_schedule_season(schedule_url))
+    archived_games = [game for game in games if game['url'] in entries]
+    print(f"Rebuilding {len(archived_games)} of {len(games)} scheduled games in {len(schedule_urls)} seasons from {ARCHIVE_DIR}")
+
+    # Player IDs are assigned here in the parent so the registry has a single writer
+    player_registry = PlayerRegistry(base_dir)
+    games_rebuilt = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(parse_archived_game, entries[game['url']], game['url']): game for game in archived_games}
+        for future in as_completed(futures):
+            game = futures[future]
+            # One bad page or failed write skips that game, not the rest of the rebuild
+            try:
+                game_tables = player_registry.key_tables(future.result())
+                save_game_tables(game_tables, get_game_dir(base_dir, game['season'], game['week'], game['winner'], game['loser']))
+            except Exception as e:
+                print(f"Failed to rebuild {game['url']}: {e}")
+                continue
+            games_rebuilt += 1
+            print(f"Rebuilt {game['season']} Week {game['week']} {game['winner']} vs {game['loser']} ({len(game_tables)} tables)")
+
+    player_registry.save()
+    print(f"Rebuilt {games_rebuilt} games in {time.time() - start:.1f}s")
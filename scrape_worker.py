@@ -0,0 +1,143 @@
+import argparse
+import socket
+import os
+import threading
+import time
+import requests
+from boxscore import SCHEDULE_URL, REQUEST_HEADERS, parse_schedule, get_schedule_season, get_game_dir, extract_game_tables, save_game_tables
+from page_archive import archive_page
+from player_ids import PlayerRegistry
+from table_schemas import apply_table_schema
+from work_queue import QUEUE_FILE, WorkQueue
+
+# Multi-node boxscore backfill on top of work_queue.py:
+#   enqueue - add every finished game on the schedule page to the queue
+#   work    - claim games, scrape them with Chrome and hand the tables back
+#   merge   - write finished games into 'Game Stats', assigning player IDs,
+#             and archive the queued pages for rebuild_game_stats.py
+#   status  - show how many games are in each state
+# Every node points --queue at the same SQLite file.
+
+base_dir = 'Game Stats'
+
+class LeaseKeeper:
+    """Heartbeats a lease from a background thread while the node works on the game."""
+
+    def __init__(self, queue_path, lease_seconds, url, node_id):
+        self.queue_path = queue_path
+        self.lease_seconds = lease_seconds
+        self.url = url
+        self.node_id = node_id
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        # SQLite connections can't be shared between threads, so use our own
+        work_queue = WorkQueue(self.queue_path, self.lease_seconds)
+        try:
+            while not self._stop.wait(self.lease_seconds / 3):
+                if not work_queue.heartbeat(self.url, self.node_id):
+                    print(f"Lost lease on {self.url}")
+                    self.lost = True
+                    return
+        finally:
+            work_queue.close()
+
+def enqueue(args):
+    season = get_schedule_season(args.schedule_url)
+    response = requests.get(args.schedule_url, headers=REQUEST_HEADERS, timeout=30)
+    response.raise_for_status()
+
+    games = [game for game in parse_schedule(response.text, season) if game['final']]
+
+    work_queue = WorkQueue(args.queue, args.lease_seconds)
+    # merge archives the schedule so rebuild_game_stats.py can map these boxscores back to their games
+    work_queue.put_page(args.schedule_url, response.text)
+    added = work_queue.enqueue(games)
+    print(f"Queued {added} new {season} games ({len(games)} finished games on the schedule)")
+
+def work(args):
+    # Imported here so enqueue/merge/status don't need Selenium installed
+    from game import create_driver
+
+    work_queue = WorkQueue(args.queue, args.lease_seconds)
+    driver = create_driver()
+    games_done = 0
+    try:
+        while True:
+            game = work_queue.claim(args.node_id)
+            if game is None:
+                if not args.wait:
+                    break
+                time.sleep(args.poll_interval)
+                continue
+
+            print(f"{args.node_id} scraping {game['season']} Week {game['week']} {game['winner']} vs {game['loser']}: {game['url']}")
+            try:
+                with LeaseKeeper(args.queue, args.lease_seconds, game['url'], args.node_id) as lease:
+                    driver.get(game['url'])
+                    html = driver.page_source
+                    game_tables = extract_game_tables(html, game['url'])
+            except Exception as e:
+                print(f"Failed to scrape {game['url']}: {e}")
+                work_queue.release(game['url'], args.node_id)
+                continue
+
+            if lease.lost or not work_queue.complete(game['url'], args.node_id, game_tables, html):
+                print(f"Discarded {game['url']}: the lease passed to another node")
+                continue
+            games_done += 1
+    finally:
+        driver.quit()
+        work_queue.close()
+    print(f"{args.node_id} finished {games_done} games")
+
+def merge(args):
+    work_queue = WorkQueue(args.queue, args.lease_seconds)
+    player_registry = PlayerRegistry(base_dir)
+
+    # Pages fetched on other nodes go into this machine's archive, next to the output they produced
+    pages = work_queue.unarchived_pages()
+    for url in pages:
+        archive_page(url, work_queue.page(url))
+        work_queue.mark_archived(url)
+
+    games = work_queue.unmerged_games()
+    for game in games:
+        game_tables = {
+            table_name: apply_table_schema(table_name, df)
+            for table_name, df in work_queue.results_for(game['url']).items()
+        }
+        game_tables = player_registry.key_tables(game_tables)
+        save_game_tables(game_tables, get_game_dir(base_dir, game['season'], game['week'], game['winner'], game['loser']))
+        player_registry.save()
+        work_queue.mark_merged(game['url'])
+    print(f"Merged {len(games)} games into {base_dir} and archived {len(pages)} pages")
+
+def status(args):
+    work_queue = WorkQueue(args.queue, args.lease_seconds)
+    for state, count in sorted(work_queue.counts().items()):
+        print(f"{state}: {count}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scrape boxscores from a shared lease-based work queue.')
+    parser.add_argument('command', choices=['enqueue', 'work', 'merge', 'status'])
+    parser.add_argument('--queue', default=QUEUE_FILE, help='shared SQLite queue file')
+    parser.add_argument('--lease-seconds', type=float, default=300)
+    parser.add_argument('--node-id', default=f'{socket.gethostname()}-{os.getpid()}')
+    parser.add_argument('--schedule-url', default=SCHEDULE_URL, help='season schedule page to enqueue, e.g. .../years/2023/games.htm')
+    parser.add_argument('--wait', action='store_true', help='keep polling for work instead of exiting when the queue is empty')
+    parser.add_argument('--poll-interval', type=float, default=30)
+    args = parser.parse_args()
+
+    {'enqueue': enqueue, 'work': work, 'merge': merge, 'status': status}[args.command](args)
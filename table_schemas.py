@@ -0,0 +1,105 @@
+import pandas as pd
+from teams import team_name_mapping
+
+# Compact dtypes for every boxscore table, applied at parse time and again
+# when a saved CSV is loaded with read_game_table. Columns that are not
+# listed (names, clock times, field position, free text) stay as text.
+# Percentages are stored without the '%' sign.
+
+# The scoring table names its running-score columns after the two teams
+TEAM_COLUMNS = '<team>'
+
+INT = 'Int16'
+FLOAT = 'float32'
+CATEGORY = 'category'
+
+# Integer keys added during extraction (see player_ids.py)
+ID_COLUMNS = {'player_id': 'Int32', 'team_id': 'Int8'}
+
+table_schemas = {
+    'scoring': {'Quarter': CATEGORY, 'Tm': CATEGORY, TEAM_COLUMNS: INT},
+    'game_info': {},
+    'expected_points': {
+        'Tm': CATEGORY, 'Tot': FLOAT, 'Off.': FLOAT, 'Pass': FLOAT, 'Rush': FLOAT, 'TOvr': FLOAT,
+        'Def.': FLOAT, 'Sp. Tms': FLOAT, 'KO': FLOAT, 'KR': FLOAT, 'P': FLOAT, 'PR': FLOAT, 'FG/XP': FLOAT,
+    },
+    # Values mix formats such as '30-185-1', so they stay as text
+    'team_stats': {},
+    'player_offense': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'Cmp': INT, 'Att': INT, 'Yds': INT, 'TD': INT, 'Int': INT, 'Sk': INT,
+        'Lng': INT, 'Rate': FLOAT, 'Tgt': INT, 'Rec': INT, 'Fmb': INT, 'FL': INT,
+    },
+    'player_defense': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'Int': INT, 'Yds': INT, 'TD': INT, 'Lng': INT, 'PD': INT, 'Sk': FLOAT,
+        'Comb': INT, 'Solo': INT, 'Ast': INT, 'TFL': INT, 'QBHits': INT, 'FR': INT, 'FF': INT,
+    },
+    'returns': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'Rt': INT, 'Yds': INT, 'Y/Rt': FLOAT, 'TD': INT, 'Lng': INT,
+        'Ret': INT, 'Y/R': FLOAT,
+    },
+    'kicking': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'XPM': INT, 'XPA': INT, 'FGM': INT, 'FGA': INT, 'Pnt': INT,
+        'Yds': INT, 'Y/P': FLOAT, 'Lng': INT,
+    },
+    'passing_advanced': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'Cmp': INT, 'Att': INT, 'Yds': INT, '1D': INT, '1D%': FLOAT,
+        'IAY': INT, 'IAY/PA': FLOAT, 'CAY': INT, 'CAY/Cmp': FLOAT, 'CAY/PA': FLOAT, 'YAC': INT,
+        'YAC/Cmp': FLOAT, 'Drops': INT, 'Drop%': FLOAT, 'BadTh': INT, 'Bad%': FLOAT, 'Sk': INT,
+        'Bltz': INT, 'Hrry': INT, 'Hits': INT, 'Prss': INT, 'Prss%': FLOAT, 'Scrm': INT, 'Yds/Scr': FLOAT,
+    },
+    'rushing_advanced': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'Att': INT, 'Yds': INT, 'TD': INT, '1D': INT, 'YBC': INT,
+        'YBC/Att': FLOAT, 'YAC': INT, 'YAC/Att': FLOAT, 'BrkTkl': INT, 'Att/Br': FLOAT,
+    },
+    'receiving_advanced': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'Tgt': INT, 'Rec': INT, 'Yds': INT, 'TD': INT, '1D': INT,
+        'YBC': INT, 'YBC/R': FLOAT, 'YAC': INT, 'YAC/R': FLOAT, 'ADOT': FLOAT, 'BrkTkl': INT,
+        'Rec/Br': FLOAT, 'Drop': INT, 'Drop%': FLOAT, 'Int': INT, 'Rat': FLOAT,
+    },
+    'defense_advanced': {
+        'Tm': CATEGORY, 'Pos': CATEGORY, 'Int': INT, 'Tgt': INT, 'Cmp': INT, 'Cmp%': FLOAT, 'Yds': INT,
+        'Yds/Cmp': FLOAT, 'Yds/Tgt': FLOAT, 'TD': INT, 'Rat': FLOAT, 'DADOT': FLOAT, 'Air': INT,
+        'YAC': INT, 'Bltz': INT, 'Hrry': INT, 'QBKD': INT, 'Sk': FLOAT, 'Prss': INT, 'Comb': INT,
+        'MTkl': INT, 'MTkl%': FLOAT,
+    },
+    'home_drives': {'#': INT, 'Quarter': CATEGORY, 'Plays': INT, 'Net Yds': INT, 'Result': CATEGORY},
+    'away_drives': {'#': INT, 'Quarter': CATEGORY, 'Plays': INT, 'Net Yds': INT, 'Result': CATEGORY},
+}
+
+def coerce_column(series, dtype):
+    if dtype == CATEGORY:
+        return series.astype(CATEGORY)
+
+    values = series
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype(str).str.strip().str.rstrip('%').str.replace(',', '', regex=False)
+    values = pd.to_numeric(values, errors='coerce')
+
+    # Fall back to float if a column we expected to be whole numbers is not
+    if dtype == INT and not (values.dropna() % 1 == 0).all():
+        dtype = FLOAT
+    return values.astype(dtype)
+
+def apply_table_schema(table_name, df):
+    """Coerce the columns of a boxscore table to the compact dtypes in its schema."""
+    schema = table_schemas.get(table_name)
+    if schema is None:
+        return df
+
+    df = df.copy()
+    schema = {**ID_COLUMNS, **schema}
+    # Work by position: player tables repeat names like 'Yds' and 'TD'
+    for i, column in enumerate(df.columns):
+        dtype = schema.get(column)
+        if dtype is None and column in team_name_mapping:
+            dtype = schema.get(TEAM_COLUMNS)
+        if dtype is not None:
+            df.isetitem(i, coerce_column(df.iloc[:, i], dtype))
+    return df
+
+def memory_usage_kb(df):
+    return df.memory_usage(deep=True).sum() / 1024
+
+def read_game_table(file_path, table_name):
+    """Load a saved boxscore CSV with its schema dtypes instead of re-inferring them."""
+    return apply_table_schema(table_name, pd.read_csv(file_path))
@@ -0,0 +1,38 @@
+# Define team name mapping from abbreviations to full club names
+team_name_mapping = {
+    "BAL": "Baltimore Ravens",
+    "KAN": "Kansas City Chiefs",
+    "BUF": "Buffalo Bills",
+    "CLE": "Cleveland Browns",
+    "PIT": "Pittsburgh Steelers",
+    "IND": "Indianapolis Colts",
+    "TEN": "Tennessee Titans",
+    "MIA": "Miami Dolphins",
+    "LAC": "Los Angeles Chargers",
+    "DEN": "Denver Broncos",
+    "CIN": "Cincinnati Bengals",
+    "JAX": "Jacksonville Jaguars",
+    "NYJ": "New York Jets",
+    "NWE": "New England Patriots",
+    "HOU": "Houston Texans",
+    "LVR": "Las Vegas Raiders",
+    "DAL": "Dallas Cowboys",
+    "WAS": "Washington Commanders",
+    "NYG": "New York Giants",
+    "PHI": "Philadelphia Eagles",
+    "DET": "Detroit Lions",
+    "CHI": "Chicago Bears",
+    "MIN": "Minnesota Vikings",
+    "GNB": "Green Bay Packers",
+    "ATL": "Atlanta Falcons",
+    "CAR": "Carolina Panthers",
+    "NOR": "New Orleans Saints",
+    "TAM": "Tampa Bay Buccaneers",
+    "ARI": "Arizona Cardinals",
+    "LAR": "Los Angeles Rams",
+    "SFO": "San Francisco 49ers",
+    "SEA": "Seattle Seahawks"
+}
+
+# Stable integer surrogate keys for teams, ordered by abbreviation
+team_ids = {abbr: team_id for team_id, abbr in enumerate(sorted(team_name_mapping), start=1)}
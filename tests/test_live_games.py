@@ -0,0 +1,78 @@
+import functools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Runs live_games.py --once against a local http.server serving the canned
+# schedule and boxscore pages in tests/stub_site
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_SITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stub_site')
+GAME_DIR = os.path.join('Game Stats', 'Season 2024', 'Week 1', 'Kansas City Chiefs vs Baltimore Ravens')
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+class LiveGamesStubServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        handler = functools.partial(QuietHandler, directory=STUB_SITE)
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.work_dir.cleanup)
+
+    def run_once(self):
+        result = subprocess.run(
+            [sys.executable, os.path.join(REPO_DIR, 'live_games.py'), '--once', '--base-url', self.base_url, '--request-delay', '0'],
+            cwd=self.work_dir.name, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        return result.stdout
+
+    def test_fetches_final_games_once(self):
+        output = self.run_once()
+        self.assertIn('Updated Week 1 Kansas City Chiefs vs Baltimore Ravens (27-20)', output)
+        self.assertNotIn('Green Bay Packers', output)
+
+        game_dir = os.path.join(self.work_dir.name, GAME_DIR)
+        with open(os.path.join(game_dir, 'player_offense.csv')) as f:
+            self.assertEqual(f.readline().strip(), 'player_id,team_id,Player,Tm,Cmp,Att,Yds,Rate')
+        # The drives table is only present inside an HTML comment
+        self.assertTrue(os.path.exists(os.path.join(game_dir, 'home_drives.csv')))
+
+        # Nothing changed on the stub, so the second poll refreshes nothing
+        self.assertNotIn('Updated', self.run_once())
+
+    def test_only_games_seen_going_final_are_rechecked(self):
+        self.run_once()
+        with open(os.path.join(self.work_dir.name, 'live_state.json')) as f:
+            state = json.load(f)
+        # Already final on first sight, so it is fetched once and never re-checked
+        self.assertEqual(state[f'{self.base_url}/boxscores/202409050kan.htm']['final_at'], 0)
+        upcoming = [seen for url, seen in state.items() if not url.endswith('202409050kan.htm')]
+        self.assertTrue(upcoming)
+        self.assertTrue(all(seen['final_at'] is None for seen in upcoming))
+
+    def test_first_run_skips_games_already_saved(self):
+        os.makedirs(os.path.join(self.work_dir.name, GAME_DIR))
+        output = self.run_once()
+        self.assertIn('Seeded live state with 1 games', output)
+        self.assertNotIn('Updated', output)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import gzip
+import sqlite3
+import time
+from io import StringIO
+import pandas as pd
+
+# Lease-based work queue for spreading a boxscore backfill over several
+# scraper nodes. The queue is a single SQLite file on storage every node can
+# reach. A node claims a game by taking a lease, extends the lease with
+# heartbeats while it works, and hands in the parsed tables when done. Leases
+# that run out are claimable again, so a crashed node's games go back to the
+# queue on their own. The raw schedule and boxscore pages travel through the
+# queue as well, so the node that merges can archive them for
+# rebuild_game_stats.py.
+
+QUEUE_FILE = 'scrape_queue.sqlite'
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+class WorkQueue:
+    def __init__(self, path=QUEUE_FILE, lease_seconds=300, max_attempts=5):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Autocommit mode; writes that must be atomic open their own transaction
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                url TEXT PRIMARY KEY,
+                season INTEGER NOT NULL,
+                week INTEGER NOT NULL,
+                winner TEXT NOT NULL,
+                loser TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                merged INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                csv TEXT NOT NULL,
+                PRIMARY KEY (url, table_name)
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                html BLOB NOT NULL,
+                archived INTEGER NOT NULL DEFAULT 0
+            );
+        ''')
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, games):
+        """Add games to the queue; games already queued are left untouched."""
+        with self._transaction():
+            cursor = self.conn.executemany(
+                'INSERT OR IGNORE INTO jobs (url, season, week, winner, loser) VALUES (?, ?, ?, ?, ?)',
+                [(game['url'], game['season'], game['week'], game['winner'], game['loser']) for game in games],
+            )
+        return cursor.rowcount
+
+    def claim(self, node_id):
+        """Lease the next pending or expired game to node_id, or return None when there is none."""
+        now = time.time()
+        with self._transaction():
+            # Games whose lease ran out too many times are given up on
+            self.conn.execute(
+                'UPDATE jobs SET status = ?, owner = NULL WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+                (FAILED, LEASED, now, self.max_attempts),
+            )
+            row = self.conn.execute(
+                'SELECT url, season, week, winner, loser FROM jobs WHERE status = ? OR (status = ? AND lease_expires < ?) ORDER BY season, week, url LIMIT 1',
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                'UPDATE jobs SET status = ?, owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE url = ?',
+                (LEASED, node_id, now + self.lease_seconds, row[0]),
+            )
+        return _game(row)
+
+    def heartbeat(self, url, node_id):
+        """Extend a lease; returns False if node_id no longer holds it."""
+        cursor = self.conn.execute(
+            'UPDATE jobs SET lease_expires = ? WHERE url = ? AND owner = ? AND status = ?',
+            (time.time() + self.lease_seconds, url, node_id, LEASED),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, url, node_id, game_tables, html):
+        """Store a game's tables and page and mark it done, unless the lease has passed to another node."""
+        with self._transaction():
+            cursor = self.conn.execute(
+                'UPDATE jobs SET status = ?, lease_expires = NULL WHERE url = ? AND owner = ? AND status = ?',
+                (DONE, url, node_id, LEASED),
+            )
+            if cursor.rowcount != 1:
+                return False
+            self.conn.execute('DELETE FROM results WHERE url = ?', (url,))
+            self.conn.executemany(
+                'INSERT INTO results (url, table_name, csv) VALUES (?, ?, ?)',
+                [(url, table_name, df.to_csv(index=False)) for table_name, df in game_tables.items()],
+            )
+            self._put_page(url, html)
+        return True
+
+    def put_page(self, url, html):
+        with self._transaction():
+            self._put_page(url, html)
+
+    def unarchived_pages(self):
+        return [url for url, in self.conn.execute('SELECT url FROM pages WHERE archived = 0 ORDER BY url')]
+
+    def page(self, url):
+        html, = self.conn.execute('SELECT html FROM pages WHERE url = ?', (url,)).fetchone()
+        return gzip.decompress(html).decode('utf-8')
+
+    def mark_archived(self, url):
+        self.conn.execute('UPDATE pages SET archived = 1 WHERE url = ?', (url,))
+
+    def release(self, url, node_id):
+        """Give a lease back after a failure so another node can retry it."""
+        self.conn.execute(
+            'UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, owner = NULL, lease_expires = NULL WHERE url = ? AND owner = ? AND status = ?',
+            (self.max_attempts, FAILED, PENDING, url, node_id, LEASED),
+        )
+
+    def unmerged_games(self):
+        rows = self.conn.execute('SELECT url, season, week, winner, loser FROM jobs WHERE status = ? AND merged = 0 ORDER BY season, week, url', (DONE,)).fetchall()
+        return [_game(row) for row in rows]
+
+    def results_for(self, url):
+        rows = self.conn.execute('SELECT table_name, csv FROM results WHERE url = ?', (url,)).fetchall()
+        return {table_name: read_result_table(csv) for table_name, csv in rows}
+
+    def mark_merged(self, url):
+        self.conn.execute('UPDATE jobs SET merged = 1 WHERE url = ?', (url,))
+
+    def counts(self):
+        now = time.time()
+        rows = self.conn.execute(
+            "SELECT CASE WHEN status = ? AND lease_expires < ? THEN 'expired' ELSE status END, COUNT(*) FROM jobs GROUP BY 1",
+            (LEASED, now),
+        ).fetchall()
+        return dict(rows)
+
+    def _put_page(self, url, html):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO pages (url, html, archived) VALUES (?, ?, 0)',
+            (url, gzip.compress(html.encode('utf-8'))),
+        )
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+class _Transaction:
+    # BEGIN IMMEDIATE takes the write lock up front so two nodes can't claim the same game
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+def _game(row):
+    url, season, week, winner, loser = row
+    return {'url': url, 'season': season, 'week': week, 'winner': winner, 'loser': loser}
+
+def read_result_table(csv_text):
+    # Read everything as text with the header kept verbatim; pandas would
+    # rename repeated headers like 'Yds' to 'Yds.1'
+    df = pd.read_csv(StringIO(csv_text), header=None, dtype=str, keep_default_na=False, na_values=[''])
+    df.columns = list(df.iloc[0])
+    return df.iloc[1:].reset_index(drop=True)